@@ -4,10 +4,12 @@
 # This add-on is free software, licensed under the terms of the GNU General Public License (version 2).
 # See the file LICENSE for more details.
 
-from collections import deque
+from bisect import bisect_left, insort
 import json
 import os
 import re
+import shutil
+from string import ascii_letters, digits
 import tempfile
 import threading
 import weakref
@@ -77,6 +79,9 @@ BOUNDARY_BEEP_FREQUENCY = 200 # Hz
 BOUNDARY_BEEP_DURATION = 100 # ms
 BOUNDARY_BEEP_VOLUME = 100 # percent
 
+HISTORY_PREVIEW_LENGTH = 100 # characters shown per row in the history dialog
+SEARCH_DELAY = 150 # ms after the last keystroke before the history dialog searches
+
 HTML_CONTAINER_START = '<ul style="list-style: none">'
 HTML_CONTAINER_END = '</ul>'
 HTML_ITEM_START = '<li>'
@@ -86,17 +91,28 @@ UPDATE_REPOSITORY = "VIPPotato/nvda-enchanced-speech-history"
 LATEST_RELEASE_API_URL = f"https://api.github.com/repos/{UPDATE_REPOSITORY}/releases/latest"
 LATEST_TAGS_API_URL = f"https://api.github.com/repos/{UPDATE_REPOSITORY}/tags?per_page=1"
 UPDATE_CHECK_TIMEOUT_SECONDS = 8
+UPDATE_CHECK_STARTUP_DELAY = 5000 # ms
 UPDATE_DOWNLOAD_TIMEOUT_SECONDS = 120
+UPDATE_CHECK_MAX_RESPONSE_BYTES = 262144
+UPDATE_DOWNLOAD_CHUNK_BYTES = 65536
+
+
+def makeHTMLListItem(string):
+	return f'{HTML_ITEM_START}{nh3.clean_text(string)}{HTML_ITEM_END}'
 
 
-def makeHTMLList(strings):
-	listItems = ''.join((f'{HTML_ITEM_START}{string}{HTML_ITEM_END}' for string in map(nh3.clean_text, strings)))
-	return f'{HTML_CONTAINER_START}{listItems}{HTML_CONTAINER_END}'
+def makeHTMLList(listItems):
+	return HTML_CONTAINER_START + ''.join(listItems) + HTML_CONTAINER_END
 
 
 def _versionToTuple(version):
 	versionString = str(version).strip().lstrip("vV")
-	parts = [int(part) for part in re.findall(r"\d+", versionString)]
+	parts = versionString.split(".")
+	if all(part.isdecimal() for part in parts):
+		# Plain dotted version such as 2026.1.1, no need for the regex.
+		parts = [int(part) for part in parts]
+	else:
+		parts = [int(part) for part in re.findall(r"\d+", versionString)]
 	if not parts:
 		return (0,)
 	return tuple(parts)
@@ -111,31 +127,51 @@ def _isVersionNewer(currentVersion, latestVersion):
 	return latestParts > currentParts
 
 
-def _fetchJSONFromGitHub(url):
-	request = urlRequest.Request(
-		url,
-		headers={
-			"Accept": "application/vnd.github+json",
-			"User-Agent": "NVDA-enchancedSpeechHistory-Updater",
-		},
-	)
+class _FileNameTranslation(dict):
+	# Used with str.translate: characters not in the table are replaced with a dash.
+	def __missing__(self, codepoint):
+		return "-"
+
+
+_SAFE_VERSION_TRANSLATION = _FileNameTranslation(
+	(ord(char), char) for char in ascii_letters + digits + "._-"
+)
+
+
+def _fetchJSONFromGitHub(url, etag=None):
+	headers = {
+		"Accept": "application/vnd.github+json",
+		"User-Agent": "NVDA-enchancedSpeechHistory-Updater",
+	}
+	if etag:
+		headers["If-None-Match"] = etag
+	request = urlRequest.Request(url, headers=headers)
 	with urlRequest.urlopen(request, timeout=UPDATE_CHECK_TIMEOUT_SECONDS) as response:
-		return json.loads(response.read().decode("utf-8"))
+		body = response.read(UPDATE_CHECK_MAX_RESPONSE_BYTES + 1)
+		etag = response.headers.get("ETag")
+	if len(body) > UPDATE_CHECK_MAX_RESPONSE_BYTES:
+		raise ValueError("GitHub response is larger than expected")
+	return json.loads(body), etag
 
 
-def _fetchLatestReleaseInfo():
+def _fetchLatestReleaseInfo(etag=None):
+	"""Return (latestVersion, downloadUrl, etag) for the latest release.
+	If etag is given and GitHub reports the release unchanged, latestVersion and downloadUrl are None.
+	"""
 	try:
-		data = _fetchJSONFromGitHub(LATEST_RELEASE_API_URL)
+		data, etag = _fetchJSONFromGitHub(LATEST_RELEASE_API_URL, etag)
 	except urlError.HTTPError as e:
+		if e.code == 304:
+			return None, None, etag
 		if e.code != 404:
 			raise
-		tagsData = _fetchJSONFromGitHub(LATEST_TAGS_API_URL)
+		tagsData, _tagsEtag = _fetchJSONFromGitHub(LATEST_TAGS_API_URL)
 		if not isinstance(tagsData, list) or not tagsData:
 			raise ValueError("No release or tag information is available from GitHub")
 		latestTag = tagsData[0].get("name")
 		if not latestTag:
 			raise ValueError("Latest tag name is missing from GitHub response")
-		return str(latestTag), None
+		return str(latestTag), None, None
 	latestVersion = data.get("tag_name") or data.get("name")
 	if not latestVersion:
 		raise ValueError("Latest release version is missing from GitHub response")
@@ -146,7 +182,27 @@ def _fetchLatestReleaseInfo():
 		if assetName.lower().endswith(".nvda-addon") and assetUrl:
 			downloadUrl = str(assetUrl)
 			break
-	return str(latestVersion), downloadUrl
+	return str(latestVersion), downloadUrl, etag
+
+
+# Update check cache keys. They are internal state rather than settings, so they are read from and
+# written to the base configuration directly: writing through config.conf would store them in whichever
+# profile happens to be active, and each profile would keep its own stale copy.
+UPDATE_CHECK_CACHE_KEYS = ('updateCheckEtag', 'updateCheckLatestVersion', 'updateCheckDownloadUrl')
+
+
+def _getUpdateCheckCache():
+	section = config.conf.profiles[0].get(CONFIG_SECTION, {})
+	return tuple(str(section.get(key, '')) for key in UPDATE_CHECK_CACHE_KEYS)
+
+
+def _setUpdateCheckCache(values):
+	if tuple(values) == _getUpdateCheckCache():
+		return
+	baseProfile = config.conf.profiles[0]
+	if CONFIG_SECTION not in baseProfile:
+		baseProfile[CONFIG_SECTION] = {}
+	baseProfile[CONFIG_SECTION].update(zip(UPDATE_CHECK_CACHE_KEYS, values))
 
 
 def _getCurrentAddonVersion():
@@ -160,6 +216,47 @@ def _getCurrentAddonVersion():
 	return "0"
 
 
+class RingHistory:
+	"""Fixed-capacity history with O(1) indexed access, newest item at index 0.
+	Storage grows on demand up to maxlen, after which the oldest slot is overwritten.
+	"""
+
+	def __init__(self, maxlen):
+		self.maxlen = maxlen
+		self._buf = []
+		# Index in self._buf of the most recently added item.
+		self._head = -1
+
+	def appendleft(self, item):
+		if len(self._buf) < self.maxlen:
+			self._buf.append(item)
+			self._head = len(self._buf) - 1
+		else:
+			self._head = (self._head + 1) % self.maxlen
+			self._buf[self._head] = item
+
+	def __getitem__(self, index):
+		size = len(self._buf)
+		if index < 0:
+			index += size
+		if not 0 <= index < size:
+			raise IndexError("history index out of range")
+		return self._buf[(self._head - index) % size]
+
+	def __len__(self):
+		return len(self._buf)
+
+	def __iter__(self):
+		buf = self._buf
+		head = self._head
+		yield from reversed(buf[:head + 1])
+		yield from reversed(buf[head + 1:])
+
+	def clear(self):
+		self._buf = []
+		self._head = -1
+
+
 class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 	_instanceRef = None
 
@@ -182,6 +279,11 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			'boundaryBeepDuration': f'integer(default={BOUNDARY_BEEP_DURATION}, min={MIN_BEEP_DURATION}, max={MAX_BEEP_DURATION})',
 			'boundaryBeepVolume': f'integer(default={BOUNDARY_BEEP_VOLUME}, min={MIN_BEEP_VOLUME}, max={MAX_BEEP_VOLUME})',
 			'checkForUpdatesOnStartup': 'boolean(default=true)',
+			# Result of the last successful update check, reused when GitHub answers 304 Not Modified.
+			# Only ever stored in the base configuration, see UPDATE_CHECK_CACHE_KEYS.
+			'updateCheckEtag': 'string(default="")',
+			'updateCheckLatestVersion': 'string(default="")',
+			'updateCheckDownloadUrl': 'string(default="")',
 			'trimWhitespaceFromStart': 'boolean(default=false)',
 			'trimWhitespaceFromEnd': 'boolean(default=false)',
 		}
@@ -189,46 +291,83 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		NVDASettingsDialog.categoryClasses.append(SpeechHistorySettingsPanel)
 		GlobalPlugin._instanceRef = weakref.ref(self)
 
-		self._history = deque(maxlen=config.conf[CONFIG_SECTION]['maxHistoryLength'])
+		self._history = RingHistory(config.conf[CONFIG_SECTION]['maxHistoryLength'])
+		# Joined text of each history item, kept in lockstep with self._history.
+		self._historyText = RingHistory(self._history.maxlen)
+		# Sanitized HTML list item for each history item, kept in lockstep with self._history so that
+		# showing the history doesn't have to run nh3 over every item again.
+		self._historyHTML = RingHistory(self._history.maxlen)
 		self._recorded = []
 		self._recording = False
 		self._updateCheckInProgress = False
 		self._updateDownloadInProgress = False
 		self.history_pos = 0
+		self._startupUpdateCheckTimer = None
+		self._refreshCfg()
+		config.post_configProfileSwitch.register(self._refreshCfg)
+		config.post_configReset.register(self._refreshCfg)
 		self._patch()
 		if config.conf[CONFIG_SECTION]['checkForUpdatesOnStartup']:
-			self.checkForUpdates(manual=False)
+			# Keep the update check off the plugin loading path; NVDA is still starting up.
+			self._startupUpdateCheckTimer = wx.CallLater(UPDATE_CHECK_STARTUP_DELAY, self.checkForUpdates, False)
 
 	def _patch(self):
-		if BUILD_YEAR >= 2021:
-			self.oldSpeak = speech.speech.speak
-			speech.speech.speak = self.mySpeak
-		else:
-			self.oldSpeak = speech.speak
-			speech.speak = self.mySpeak
+		speechModule = speech.speech if BUILD_YEAR >= 2021 else speech
+		self.oldSpeak = speechModule.speak
+		self.mySpeak = self._makeSpeakHook()
+		speechModule.speak = self.mySpeak
+
+	def _makeSpeakHook(self):
+		# The hook runs for every utterance, so everything it needs is bound to locals
+		# up front rather than looked up on self for each call.
+		oldSpeak = self.oldSpeak
+		appendToHistory = self.append_to_history
+		separator = speechViewer.SPEECH_ITEM_SEPARATOR
+
+		def mySpeak(sequence, *args, **kwargs):
+			oldSpeak(sequence, *args, **kwargs)
+			strings = [x for x in sequence if isinstance(x, str)]
+			# Sequences made up only of commands have nothing to record.
+			if not strings:
+				return
+			text = separator.join(strings)
+			# Same test as text.strip(), without building the stripped copy.
+			if text and not text.isspace():
+				queueFunction(eventQueue, appendToHistory, sequence, text)
+
+		return mySpeak
 
 	def _speakMessage(self, message):
 		self.oldSpeak([message])
 
+	def _refreshCfg(self):
+		# Settings used while reviewing and copying history are cached here, and refreshed
+		# whenever the configuration changes, to keep config lookups out of those paths.
+		section = config.conf[CONFIG_SECTION]
+		self._postCopyAction = section['postCopyAction']
+		self._beepFreq = section['beepFrequency']
+		self._beepDur = section['beepDuration']
+		self._beepVolume = section['beepVolume']
+		self._panning = section['beepBoundaryPanning']
+		self._boundaryBeepFreq = section['boundaryBeepFrequency']
+		self._boundaryBeepDur = section['boundaryBeepDuration']
+		self._boundaryBeepVolume = section['boundaryBeepVolume']
+		self._trimWhitespaceFromStart = section['trimWhitespaceFromStart']
+		self._trimWhitespaceFromEnd = section['trimWhitespaceFromEnd']
+
 	def _performPostCopyFeedback(self):
-		postCopyAction = config.conf[CONFIG_SECTION]['postCopyAction']
+		postCopyAction = self._postCopyAction
 		if postCopyAction in (POST_COPY_BEEP, POST_COPY_BOTH):
-			volume = config.conf[CONFIG_SECTION]['beepVolume']
-			tones.beep(
-				config.conf[CONFIG_SECTION]['beepFrequency'],
-				config.conf[CONFIG_SECTION]['beepDuration'],
-				volume,
-				volume,
-			)
+			tones.beep(self._beepFreq, self._beepDur, self._beepVolume, self._beepVolume)
 		if postCopyAction in (POST_COPY_SPEAK, POST_COPY_BOTH):
 			# Translators: A short confirmation message spoken after copying a Enchanced Speech History item.
 			self._speakMessage(_('Copied'))
 
 	def _beepHistoryBoundary(self, atBeginning):
-		frequency = config.conf[CONFIG_SECTION]['boundaryBeepFrequency']
-		duration = config.conf[CONFIG_SECTION]['boundaryBeepDuration']
-		volume = config.conf[CONFIG_SECTION]['boundaryBeepVolume']
-		if config.conf[CONFIG_SECTION]['beepBoundaryPanning']:
+		frequency = self._boundaryBeepFreq
+		duration = self._boundaryBeepDur
+		volume = self._boundaryBeepVolume
+		if self._panning:
 			if atBeginning:
 				tones.beep(frequency, duration, 0, volume)
 			else:
@@ -243,21 +382,28 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 				ui.message(_('Enchanced Speech History update check is already in progress.'))
 			return
 		self._updateCheckInProgress = True
+		cachedRelease = _getUpdateCheckCache()
 		threading.Thread(
 			target=self._checkForUpdatesWorker,
-			args=(manual,),
+			args=(manual, cachedRelease),
 			daemon=True,
 		).start()
 
-	def _checkForUpdatesWorker(self, manual):
+	def _checkForUpdatesWorker(self, manual, cachedRelease):
 		currentVersion = _getCurrentAddonVersion()
 		latestVersion = None
 		downloadUrl = None
+		etag = None
 		errorMessage = None
 		isNewVersion = False
+		cachedEtag, cachedVersion, cachedDownloadUrl = cachedRelease
 
 		try:
-			latestVersion, downloadUrl = _fetchLatestReleaseInfo()
+			# Only send the cached ETag if there is a cached result to fall back on.
+			latestVersion, downloadUrl, etag = _fetchLatestReleaseInfo(cachedEtag if cachedVersion else None)
+			if latestVersion is None:
+				latestVersion = cachedVersion
+				downloadUrl = cachedDownloadUrl or None
 			isNewVersion = _isVersionNewer(currentVersion, latestVersion)
 		except (urlError.URLError, ValueError, json.JSONDecodeError) as e:
 			errorMessage = str(e)
@@ -270,6 +416,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			currentVersion,
 			latestVersion,
 			downloadUrl,
+			etag,
 			isNewVersion,
 			errorMessage,
 		)
@@ -280,6 +427,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			currentVersion,
 			latestVersion,
 			downloadUrl,
+			etag,
 			isNewVersion,
 			errorMessage,
 	):
@@ -291,6 +439,8 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 				ui.message(_('Could not check for Enchanced Speech History updates.'))
 			return
 
+		_setUpdateCheckCache((etag or '', latestVersion or '', downloadUrl or ''))
+
 		if isNewVersion and latestVersion:
 			if not downloadUrl:
 				if manual:
@@ -342,17 +492,21 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 				downloadUrl,
 				headers={"User-Agent": "NVDA-enchancedSpeechHistory-Updater"},
 			)
-			with urlRequest.urlopen(request, timeout=UPDATE_DOWNLOAD_TIMEOUT_SECONDS) as response:
-				data = response.read()
-			if not data:
-				raise ValueError("Downloaded update package is empty")
-			safeVersion = re.sub(r"[^0-9A-Za-z._-]", "-", str(latestVersion))
+			safeVersion = str(latestVersion).translate(_SAFE_VERSION_TRANSLATION)
 			fileName = f"enchancedSpeechHistory-{safeVersion}.nvda-addon"
 			downloadedPath = os.path.join(tempfile.gettempdir(), fileName)
-			with open(downloadedPath, "wb") as addonPackage:
-				addonPackage.write(data)
+			with urlRequest.urlopen(request, timeout=UPDATE_DOWNLOAD_TIMEOUT_SECONDS) as response, open(downloadedPath, "wb") as addonPackage:
+				shutil.copyfileobj(response, addonPackage, UPDATE_DOWNLOAD_CHUNK_BYTES)
+				if addonPackage.tell() == 0:
+					raise ValueError("Downloaded update package is empty")
 		except Exception as e:
 			errorMessage = str(e)
+			if downloadedPath and os.path.isfile(downloadedPath):
+				try:
+					os.remove(downloadedPath)
+				except OSError:
+					pass
+			downloadedPath = None
 
 		wx.CallAfter(
 			self._onUpdateDownloadComplete,
@@ -383,10 +537,10 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			# Translators: A message shown when users try to copy a history item but history is empty.
 			self._speakMessage(_('No history items.'))
 			return
-		text = self.getSequenceText(self._history[self.history_pos])
-		if config.conf[CONFIG_SECTION]['trimWhitespaceFromStart']:
+		text = self._historyText[self.history_pos]
+		if self._trimWhitespaceFromStart:
 			text = text.lstrip()
-		if config.conf[CONFIG_SECTION]['trimWhitespaceFromEnd']:
+		if self._trimWhitespaceFromEnd:
 			text = text.rstrip()
 
 		if api.copyToClip(text):
@@ -466,7 +620,7 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 			# Translators: A message shown when users try to view their Enchanced Speech History but it's empty.
 			message = _('No history items.')
 		else:
-			message = makeHTMLList((self.getSequenceText(item) for item in self._history))
+			message = makeHTMLList(self._historyHTML)
 
 		# Translators: The title of the Enchanced Speech History window.
 		title = _('Enchanced Speech History')
@@ -491,6 +645,11 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 
 	def terminate(self, *args, **kwargs):
 		super().terminate(*args, **kwargs)
+		if self._startupUpdateCheckTimer is not None:
+			self._startupUpdateCheckTimer.Stop()
+			self._startupUpdateCheckTimer = None
+		config.post_configProfileSwitch.unregister(self._refreshCfg)
+		config.post_configReset.unregister(self._refreshCfg)
 		if BUILD_YEAR >= 2021:
 			speech.speech.speak = self.oldSpeak
 		else:
@@ -499,24 +658,23 @@ class GlobalPlugin(globalPluginHandler.GlobalPlugin):
 		if GlobalPlugin.getInstance() is self:
 			GlobalPlugin._instanceRef = None
 
-	def append_to_history(self, seq):
-		seq = [command for command in seq if not isinstance(command, FocusLossCancellableSpeechCommand)]
+	def append_to_history(self, seq, text):
+		# Most sequences contain no focus loss commands, so only copy the ones that do.
+		cls = FocusLossCancellableSpeechCommand
+		if any(isinstance(command, cls) for command in seq):
+			seq = [command for command in seq if not isinstance(command, cls)]
 		self._history.appendleft(seq)
+		self._historyText.appendleft(text)
+		if BROWSE_MODE_HISTORY_SUPPORTED:
+			self._historyHTML.appendleft(makeHTMLListItem(text))
 		self.history_pos = 0
 		if self._recording:
-			self._recorded.append(self.getSequenceText(seq))
-
-	def mySpeak(self, sequence, *args, **kwargs):
-		self.oldSpeak(sequence, *args, **kwargs)
-		text = self.getSequenceText(sequence)
-		if text.strip():
-			queueFunction(eventQueue, self.append_to_history, sequence)
-
-	def getSequenceText(self, sequence):
-		return speechViewer.SPEECH_ITEM_SEPARATOR.join([x for x in sequence if isinstance(x, str)])
+			self._recorded.append(text)
 
 	def clearHistory(self):
 		self._history.clear()
+		self._historyText.clear()
+		self._historyHTML.clear()
 		self.history_pos = 0
 		self._recorded.clear()
 
@@ -675,6 +833,9 @@ class SpeechHistorySettingsPanel(SettingsPanel):
 		config.conf[CONFIG_SECTION]['checkForUpdatesOnStartup'] = self.checkForUpdatesOnStartupCB.GetValue()
 		config.conf[CONFIG_SECTION]['trimWhitespaceFromStart'] = self.trimWhitespaceFromStartCB.GetValue()
 		config.conf[CONFIG_SECTION]['trimWhitespaceFromEnd'] = self.trimWhitespaceFromEndCB.GetValue()
+		addon = GlobalPlugin.getInstance()
+		if addon is not None:
+			addon._refreshCfg()
 
 
 class HistoryDialog(
@@ -713,10 +874,13 @@ class HistoryDialog(
 
 		self.addon = addon
 		self.history = []
+		self._historyLower = []
 		self.searchHistory = []
 		self.searches = {"": 0}
 		self.curSearch = ""
-		self.selection = set()
+		# Indices of the selected rows, kept in ascending order.
+		self.selection = []
+		self._searchTimer = None
 
 		szMain = guiHelper.BoxSizerHelper(self, sizer=wx.BoxSizer(wx.VERTICAL))
 		szCurrent = guiHelper.BoxSizerHelper(self, sizer=wx.BoxSizer(wx.HORIZONTAL))
@@ -728,15 +892,18 @@ class HistoryDialog(
 			wx.TextCtrl,
 			style=wx.TE_PROCESS_ENTER,
 		)
+		self.searchTextField.Bind(wx.EVT_TEXT, self.onSearchTextChanged)
 		self.searchTextField.Bind(wx.EVT_TEXT_ENTER, self.onSearch)
 		self.searchTextField.Bind(wx.EVT_KILL_FOCUS, self.onSearch)
 
 		# Translators: The label for the history entries list in the Enchanced Speech History dialog.
 		entriesLabel = _("History list")
+		# Virtual list: rows are fetched through getHistoryItemText only when they are displayed.
 		self.historyList = nvdaControls.AutoWidthColumnListCtrl(
 			parent=self,
 			autoSizeColumn=1,
-			style=wx.LC_REPORT | wx.LC_NO_HEADER,
+			itemTextCallable=self.getHistoryItemText,
+			style=wx.LC_REPORT | wx.LC_NO_HEADER | wx.LC_VIRTUAL,
 		)
 		szMain.addItem(self.historyList, flag=wx.EXPAND, proportion=4)
 		# This list has one hidden header column used as a placeholder.
@@ -803,20 +970,23 @@ class HistoryDialog(
 		self.historyList.SetFocus()
 
 	def updateHistory(self):
-		self.selection = set()
-		self.history = [self.addon.getSequenceText(item) for item in self.addon._history]
+		self.selection = []
+		self.history = list(self.addon._historyText)
+		self._historyLower = [item.lower() for item in self.history]
 		self.doSearch(self.curSearch)
 
 	def doSearch(self, text=""):
-		self.selection = set()
+		self.selection = []
 		if not text:
 			self.searchHistory = list(self.history)
 		else:
-			self.searchHistory = [item for item in self.history if text in item.lower()]
+			self.searchHistory = [item for item, lower in zip(self.history, self._historyLower) if text in lower]
+		# A virtual list keeps its native selection across SetItemCount, so clear it first;
+		# otherwise rows selected before the search stay selected but refer to other items.
 		self.historyList.DeleteAllItems()
 		self.currentTextElement.SetValue("")
-		for item in self.searchHistory:
-			self.historyList.Append((item[0:100],))
+		self.historyList.SetItemCount(len(self.searchHistory))
+		self.historyList.Refresh()
 		if self.searchHistory:
 			index = self.searches.get(text, 0)
 			if index >= len(self.searchHistory):
@@ -825,13 +995,33 @@ class HistoryDialog(
 			self.historyList.Select(index, on=1)
 			self.historyList.SetItemState(index, wx.LIST_STATE_FOCUSED, wx.LIST_STATE_FOCUSED)
 
+	def getHistoryItemText(self, item, column):
+		return self.searchHistory[item][:HISTORY_PREVIEW_LENGTH]
+
 	def updateSelection(self):
-		self.currentTextElement.SetValue(self.itemsToString(sorted(self.selection)))
+		self.currentTextElement.SetValue(self._joinSelection(self.selection))
+
+	def _joinAll(self):
+		return "\n".join(self.searchHistory)
 
-	def itemsToString(self, items):
-		return "\n".join([self.searchHistory[index] for index in items if index < len(self.searchHistory)])
+	def _joinSelection(self, sortedIndices):
+		searchHistory = self.searchHistory
+		return "\n".join([searchHistory[index] for index in sortedIndices])
+
+	def onSearchTextChanged(self, evt):
+		# Wait for typing to pause so that fast typing results in a single search.
+		if self._searchTimer is not None and self._searchTimer.IsRunning():
+			self._searchTimer.Restart(SEARCH_DELAY)
+		else:
+			self._searchTimer = wx.CallLater(SEARCH_DELAY, self.onSearch, None)
+
+	def _stopSearchTimer(self):
+		if self._searchTimer is not None:
+			self._searchTimer.Stop()
+			self._searchTimer = None
 
 	def onSearch(self, evt):
+		self._stopSearchTimer()
 		text = self.searchTextField.GetValue().lower()
 		if text == self.curSearch:
 			return
@@ -843,6 +1033,7 @@ class HistoryDialog(
 		self.doSearch(text)
 
 	def onClose(self, evt):
+		self._stopSearchTimer()
 		self.DestroyChildren()
 		self.Destroy()
 
@@ -852,7 +1043,7 @@ class HistoryDialog(
 			self.addon._performPostCopyFeedback()
 
 	def onCopyAll(self, evt):
-		text = self.itemsToString(range(0, len(self.searchHistory)))
+		text = self._joinAll()
 		if text and api.copyToClip(text):
 			self.addon._performPostCopyFeedback()
 
@@ -866,10 +1057,18 @@ class HistoryDialog(
 
 	def onSelect(self, evt):
 		index = evt.GetIndex()
-		self.selection.add(index)
+		position = bisect_left(self.selection, index)
+		if position == len(self.selection) or self.selection[position] != index:
+			insort(self.selection, index)
 		self.updateSelection()
 
 	def onDeselect(self, evt):
 		index = evt.GetIndex()
-		self.selection.discard(index)
+		if index < 0:
+			# Virtual lists report deselection of all items at once with an index of -1.
+			self.selection.clear()
+		else:
+			position = bisect_left(self.selection, index)
+			if position < len(self.selection) and self.selection[position] == index:
+				del self.selection[position]
 		self.updateSelection()